@@ -2,10 +2,12 @@
 Filename / URL patterns.
 """
 import inspect
-from dataclasses import dataclass, field, replace
+import math
+from dataclasses import dataclass, field
 from enum import Enum, auto
+from functools import cached_property
 from hashlib import sha256
-from itertools import product
+from itertools import islice, product
 from typing import (
     Any,
     Callable,
@@ -79,6 +81,9 @@ class DimIndex:
     :param operation: What type of Combine Operation does this dimension represent.
     """
 
+    # one of these is created per dimension per input, so avoid a per-instance ``__dict__``
+    __slots__ = ("name", "index", "sequence_len", "operation")
+
     name: str
     index: int
     sequence_len: int
@@ -92,9 +97,17 @@ class DimIndex:
         assert self.index >= 0
         assert self.index < self.sequence_len
 
+    # frozen instances without a ``__dict__`` can't be unpickled through ``setattr``
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
 
 class Index(FrozenSet[DimIndex]):
-    pass
+    __slots__ = ()
 
 
 CombineDim = Union[MergeDim, ConcatDim]
@@ -118,6 +131,28 @@ class FileType(AutoName):
     zarr = auto()
 
 
+def _format_arg_order(
+    format_function: Callable, combine_dims: Sequence[CombineDim]
+) -> Optional[Tuple[int, ...]]:
+    """If ``format_function`` takes exactly one positional-or-keyword argument named after each
+    combine dim, return the position in ``combine_dims`` of each argument, in signature order,
+    so that it can be called positionally. Otherwise return ``None``.
+    """
+    try:
+        # don't follow ``__wrapped__``: the wrapper is what actually gets called
+        params = inspect.signature(format_function, follow_wrapped=False).parameters.values()
+    except (TypeError, ValueError):  # e.g. some builtins have no retrievable signature
+        return None
+    positions = {op.name: i for i, op in enumerate(combine_dims)}
+    if len(params) != len(combine_dims) or len(positions) != len(combine_dims):
+        return None
+    if any(
+        p.kind != inspect.Parameter.POSITIONAL_OR_KEYWORD or p.name not in positions for p in params
+    ):
+        return None
+    return tuple(positions[p.name] for p in params)
+
+
 class FilePattern:
     """Represents an n-dimensional matrix of individual files to be combined
     through a combination of merge and concat operations. Each operation generates
@@ -136,6 +171,9 @@ class FilePattern:
     :param file_type: The file format of the source files for this pattern. Must be one of
       the options defined by ``pangeo_forge_recipes.patterns.FileType``.
       Note: ``FileType.opendap`` cannot be used with caching.
+
+    ``format_function`` and ``combine_dims`` should be treated as immutable once the
+    pattern is constructed; the properties derived from them are computed only once.
     """
 
     def __init__(
@@ -158,83 +196,126 @@ class FilePattern:
                 "When passing `fsspec_open_kwargs`, `file_type` cannot be `opendap`."
             )
 
+        # precompute per-dim lookups so that iterating and indexing don't rescan combine_dims
+        self._shape = tuple(len(op.keys) for op in combine_dims)
+        self._ranges = tuple(range(n) for n in self._shape)
+        self._dims_by_key = {(op.name, op.operation): i for i, op in enumerate(combine_dims)}
+        if len(self._dims_by_key) != len(combine_dims):
+            raise ValueError(
+                "Each combine dim must have a unique combination of `name` and `operation`."
+            )
+        self._merge = tuple(op for op in combine_dims if isinstance(op, MergeDim))
+        self._concat = tuple(op for op in combine_dims if isinstance(op, ConcatDim))
+        self._format_arg_order = _format_arg_order(format_function, combine_dims)
+
     def __repr__(self):
         return f"<FilePattern {self.dims}>"
 
-    @property
+    @cached_property
     def dims(self) -> Dict[str, int]:
         """Dictionary representing the dimensions of the FilePattern. Keys are
-        dimension names, values are the number of items along each dimension."""
-        return {op.name: len(op.keys) for op in self.combine_dims}
+        dimension names, values are the number of items along each dimension.
+        The returned dict is cached and shared, so it must not be modified."""
+        return {op.name: n for op, n in zip(self.combine_dims, self._shape)}
 
     @property
     def shape(self) -> Tuple[int, ...]:
         """Shape of the filename matrix."""
-        return tuple([len(op.keys) for op in self.combine_dims])
+        return self._shape
 
-    @property
+    @cached_property
+    def size(self) -> int:
+        """Total number of files in the pattern."""
+        return math.prod(self._shape)
+
+    def __len__(self) -> int:
+        """Number of files in the pattern, without iterating over it."""
+        return self.size
+
+    @cached_property
     def merge_dims(self) -> List[str]:
-        """List of dims that are merge operations"""
-        return [op.name for op in self.combine_dims if op.operation == CombineOp.MERGE]
+        """List of dims that are merge operations. The returned list is cached and
+        shared, so it must not be modified."""
+        return [op.name for op in self._merge]
 
-    @property
+    @cached_property
     def concat_dims(self) -> List[str]:
-        """List of dims that are concat operations"""
-        return [op.name for op in self.combine_dims if op.operation == CombineOp.CONCAT]
+        """List of dims that are concat operations. The returned list is cached and
+        shared, so it must not be modified."""
+        return [op.name for op in self._concat]
 
-    @property
+    @cached_property
     def nitems_per_input(self) -> Dict[str, Union[int, None]]:
-        """Dictionary mapping concat dims to number of items per file."""
-        nitems = {}  # type: Dict[str, Union[int, None]]
-        for op in self.combine_dims:
-            if isinstance(op, ConcatDim):
-                if op.nitems_per_file:
-                    nitems[op.name] = op.nitems_per_file
-                else:
-                    nitems[op.name] = None
-        return nitems
+        """Dictionary mapping concat dims to number of items per file. The returned
+        dict is cached and shared, so it must not be modified."""
+        return {op.name: (op.nitems_per_file or None) for op in self._concat}
 
-    @property
+    @cached_property
     def concat_sequence_lens(self) -> Dict[str, Optional[int]]:
         """Dictionary mapping concat dims to sequence lengths.
-        Only available if ``nitems_per_input`` is set on the dimension."""
+        Only available if ``nitems_per_input`` is set on the dimension. The returned
+        dict is cached and shared, so it must not be modified."""
         return {
-            dim_name: (nitems * self.dims[dim_name] if nitems is not None else None)
-            for dim_name, nitems in self.nitems_per_input.items()
+            op.name: (op.nitems_per_file * len(op.keys) if op.nitems_per_file else None)
+            for op in self._concat
         }
 
     def __getitem__(self, indexer: FilePatternIndex) -> str:
-        """Get a filename path for a particular key."""
+        """Get a filename path for a particular key. As noted on the class, this relies on
+        ``format_function`` and ``combine_dims`` not changing after construction."""
         assert len(indexer) == len(self.combine_dims)
-        format_function_kwargs = {}
+        position = [None] * len(self.combine_dims)  # type: List[Optional[int]]
         for idx in indexer:
-            dims = [
-                dim
-                for dim in self.combine_dims
-                if dim.name == idx.name and dim.operation == idx.operation
-            ]
-            if len(dims) != 1:
-                raise KeyError(r"Could not valid combine_dim for indexer {idx}")
-            dim = dims[0]
-            format_function_kwargs[dim.name] = dim.keys[idx.index]
-        fname = self.format_function(**format_function_kwargs)
-        return fname
+            i = self._dims_by_key.get((idx.name, idx.operation))
+            if i is None:
+                raise KeyError(f"Could not find valid combine_dim for indexer {idx}")
+            position[i] = idx.index
+        missing = [op.name for op, v in zip(self.combine_dims, position) if v is None]
+        if missing:
+            raise KeyError(f"Indexer {indexer} does not cover combine_dims {missing}")
+        return self._fname(position)  # type: ignore
+
+    def _index(self, position: Sequence[int]) -> FilePatternIndex:
+        """Key for the file at ``position``, one index per combine dim."""
+        return Index(
+            DimIndex(op.name, v, n, op.operation)
+            for op, n, v in zip(self.combine_dims, self._shape, position)
+        )
+
+    def _fname(self, position: Sequence[int]) -> str:
+        """Filename for the file at ``position``, one index per combine dim."""
+        order = self._format_arg_order
+        if order is None:
+            return self.format_function(
+                **{op.name: op.keys[v] for op, v in zip(self.combine_dims, position)}
+            )
+        return self.format_function(*[self.combine_dims[i].keys[position[i]] for i in order])
 
     def __iter__(self) -> Iterator[FilePatternIndex]:
         """Iterate over all keys in the pattern."""
-        for val in product(*[range(n) for n in self.shape]):
-            index = Index(
-                (
-                    DimIndex(op.name, v, len(op.keys), op.operation)
-                    for op, v in zip(self.combine_dims, val)
-                )
-            )
-            yield index
+        for position in product(*self._ranges):
+            yield self._index(position)
 
-    def items(self):
+    def items(self) -> Iterator[Tuple[FilePatternIndex, str]]:
         """Iterate over key, filename pairs."""
-        for key in self:
-            yield key, self[key]
+        # equivalent to ``(key, self[key]) for key in self``, without resolving each key's dims
+        for position in product(*self._ranges):
+            yield self._index(position), self._fname(position)
+
+    def batched_items(self, batch_size: int = 1024) -> Iterator[List[Tuple[FilePatternIndex, str]]]:
+        """Iterate over lists of at most ``batch_size`` key, filename pairs, so that
+        large patterns can be consumed in bounded memory.
+
+        :param batch_size: Maximum number of pairs in each list.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size!r}")
+        items = self.items()
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                return
+            yield batch
 
     @property
     def sha256(self):
@@ -269,8 +350,9 @@ def prune_pattern(fp: FilePattern, nkeep: int = 2) -> FilePattern:
         if isinstance(cdim, MergeDim):
             new_combine_dims.append(cdim)
         elif isinstance(cdim, ConcatDim):
-            new_keys = cdim.keys[:nkeep]
-            new_cdim = replace(cdim, keys=new_keys)
+            new_cdim = ConcatDim(
+                name=cdim.name, keys=cdim.keys[:nkeep], nitems_per_file=cdim.nitems_per_file
+            )
             new_combine_dims.append(new_cdim)
         else:  # pragma: no cover
             assert "Should never happen"
@@ -301,11 +383,7 @@ def pattern_blockchain(pattern: FilePattern) -> List[bytes]:
         "fsspec_open_kwargs": pattern.fsspec_open_kwargs,
         "query_string_secrets": pattern.query_string_secrets,
         "file_type": pattern.file_type,
-        "nitems_per_file": {
-            op.name: op.nitems_per_file  # type: ignore
-            for op in pattern.combine_dims
-            if op.name in pattern.concat_dims
-        },
+        "nitems_per_file": {op.name: op.nitems_per_file for op in pattern._concat},
     }
     # by dropping empty values from ``root``, we allow for the attributes of ``FilePattern`` to
     # change while allowing for backwards-compatibility between hashes of patterns which do not
@@ -58,7 +58,7 @@ def finalize(config: HDFReferenceRecipe):
             coo_dtypes=config.coo_dtypes,
             coo_map=config.coo_map,
             identical_dims=config.identical_dims,
-            concat_dims=config.file_pattern.concat_dims,
+            concat_dims=list(config.file_pattern.concat_dims),
             preprocess=config.preprocess,
             postprocess=config.postprocess,
         )
@@ -889,10 +889,10 @@ class XarrayZarrRecipe(BaseRecipe, StorageMixin, FilePatternMixin):
             chunk_concat_dim = replace(
                 concat_dim, index=chunk_concat_index, sequence_len=chunk_sequence_len
             )
-            chunk_key_base = [
+            chunk_key_base = tuple(
                 chunk_concat_dim if dim_idx.operation == CombineOp.CONCAT else dim_idx
                 for dim_idx in input_key
-            ]
+            )
             if len(self.subset_inputs) == 0:
                 yield Index(chunk_key_base)
                 # no subsets
@@ -900,8 +900,8 @@ class XarrayZarrRecipe(BaseRecipe, StorageMixin, FilePatternMixin):
             subset_iterators = [range(v) for k, v in self.subset_inputs.items()]
             for i in product(*subset_iterators):
                 # TODO: remove redundant name
-                subset_dims = [
+                subset_dims = tuple(
                     DimIndex(*args, CombineOp.SUBSET)
                     for args in zip(self.subset_inputs.keys(), i, self.subset_inputs.values())
-                ]
-                yield Index((chunk_key_base + subset_dims))
+                )
+                yield Index(chunk_key_base + subset_dims)
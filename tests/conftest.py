@@ -181,7 +181,7 @@ def make_netcdf_http_paths(netcdf_local_paths, request):
 @pytest.fixture(scope="session")
 def daily_xarray_dataset():
     """Return a synthetic random xarray dataset."""
-    np.random.seed(1)
+    rng = np.random.default_rng(1)
     # TODO: change nt to 11 in order to catch the edge case where
     # items_per_input does not evenly divide the length of the sequence dimension
     nt, ny, nx = 10, 18, 36
@@ -190,10 +190,10 @@ def daily_xarray_dataset():
     lon_attrs = {"units": "degrees_east", "long_name": "longitude"}
     lat = (np.arange(ny) + 0.5) * 180 / ny
     lat_attrs = {"units": "degrees_north", "long_name": "latitude"}
-    foo = np.random.rand(nt, ny, nx)
+    foo = rng.random((nt, ny, nx))
     foo_attrs = {"long_name": "Fantastic Foo"}
     # make sure things work with heterogenous data types
-    bar = np.random.randint(0, 10, size=(nt, ny, nx))
+    bar = rng.integers(0, 10, size=(nt, ny, nx))
     bar_attrs = {"long_name": "Beautiful Bar"}
     dims = ("time", "lat", "lon")
     ds = xr.Dataset(
@@ -1,3 +1,4 @@
+import functools
 import inspect
 
 import pytest
@@ -5,8 +6,10 @@ import pytest
 from pangeo_forge_recipes.patterns import (
     CombineOp,
     ConcatDim,
+    DimIndex,
     FilePattern,
     FileType,
+    Index,
     MergeDim,
     pattern_from_file_sequence,
     prune_pattern,
@@ -66,10 +69,107 @@ def test_file_pattern_concat(concat_pattern):
     assert fp.nitems_per_input == {"time": None}
     assert fp.concat_sequence_lens == {"time": None}
     assert len(list(fp)) == 3
+    assert len(fp) == fp.size == 3
     for key, expected_value in zip(fp, ["T_0", "T_1", "T_2"]):
         assert fp[key] == expected_value
 
 
+def test_file_pattern_invalid_key(concat_pattern):
+    fp = concat_pattern
+    with pytest.raises(KeyError):
+        fp[Index([DimIndex("time", 0, 3, CombineOp.MERGE)])]
+    with pytest.raises(KeyError):
+        fp[Index([DimIndex("foo", 0, 3, CombineOp.CONCAT)])]
+    fp_merge = make_concat_merge_pattern()[0]
+    with pytest.raises(KeyError, match="variable"):
+        fp_merge[
+            Index(
+                [DimIndex("time", 0, 3, CombineOp.CONCAT), DimIndex("time", 1, 3, CombineOp.CONCAT)]
+            )
+        ]
+    # duplicate combine dims would make keys ambiguous, so they are rejected up front
+    with pytest.raises(ValueError, match="unique"):
+        FilePattern(fp.format_function, *fp.combine_dims, *fp.combine_dims)
+
+
+@pytest.mark.parametrize("pickle", [False, True])
+def test_index_roundtrip(pickle, concat_merge_pattern):
+    if pickle:
+        from cloudpickle import dumps, loads
+    else:
+        from copy import deepcopy
+
+        def dumps(obj):
+            return obj
+
+        loads = deepcopy
+
+    fp = concat_merge_pattern[0]
+    for key in fp:
+        new_key = loads(dumps(key))
+        assert type(new_key) is Index
+        assert new_key == key
+        assert hash(new_key) == hash(key)
+        assert fp[new_key] == fp[key]
+
+
+@pytest.mark.parametrize("batch_size", [1, 4, 6, 10])
+def test_file_pattern_batched_items(batch_size, concat_merge_pattern):
+    fp = concat_merge_pattern[0]
+    batches = list(fp.batched_items(batch_size))
+    assert all(0 < len(batch) <= batch_size for batch in batches)
+    assert [item for batch in batches for item in batch] == list(fp.items())
+    with pytest.raises(ValueError):
+        next(fp.batched_items(0))
+
+
+def _format_positional(variable, time):
+    return f"T_{time}_V_{variable}"
+
+
+def _format_kwargs(**kwargs):
+    return f"T_{kwargs['time']}_V_{kwargs['variable']}"
+
+
+def _format_extra_arg(time, variable, prefix="T"):
+    return f"{prefix}_{time}_V_{variable}"
+
+
+def _format_keyword_only(*, time, variable):
+    return f"T_{time}_V_{variable}"
+
+
+def _kwargs_only_decorator(func):
+    @functools.wraps(func)
+    def wrapper(**kwargs):
+        return func(**kwargs)
+
+    return wrapper
+
+
+@pytest.mark.parametrize(
+    "format_function",
+    [
+        _format_positional,
+        _format_kwargs,
+        _format_extra_arg,
+        _format_keyword_only,
+        _kwargs_only_decorator(_format_positional),
+    ],
+)
+def test_file_pattern_format_function_signatures(format_function):
+    times = list(range(3))
+    varnames = ["foo", "bar"]
+    fp = FilePattern(
+        format_function,
+        ConcatDim(name="time", keys=times),
+        MergeDim(name="variable", keys=varnames),
+    )
+    expected = [f"T_{t}_V_{v}" for t in times for v in varnames]
+    assert [fp[key] for key in fp] == expected
+    assert [fname for _, fname in fp.items()] == expected
+
+
 def test_pattern_from_file_sequence():
     file_sequence = ["T_0", "T_1", "T_2"]
     fp = pattern_from_file_sequence(file_sequence, "time")
@@ -118,6 +218,7 @@ def test_file_pattern_concat_merge(runtime_secrets, pickle, concat_merge_pattern
     assert fp.nitems_per_input == {"time": None}
     assert fp.concat_sequence_lens == {"time": None}
     assert len(list(fp)) == 6
+    assert len(fp) == fp.size == 6
     for key in fp:
         for k in key:
             if k.name == "time":
@@ -130,6 +231,7 @@ def test_file_pattern_concat_merge(runtime_secrets, pickle, concat_merge_pattern
                 variable_val = varnames[k.index]
         expected_fname = format_function(time=time_val, variable=variable_val)
         assert fp[key] == expected_fname
+    assert list(fp.items()) == [(key, fp[key]) for key in fp]
 
     if "fsspec_open_kwargs" in kwargs.keys():
         assert fp.file_type != FileType.opendap
@@ -171,7 +273,9 @@ def test_prune(nkeep, concat_merge_pattern_with_kwargs, runtime_secrets):
 
     fp_pruned = prune_pattern(fp, nkeep=nkeep)
     assert fp_pruned.dims == {"variable": 2, "time": nkeep}
+    assert fp_pruned.nitems_per_input == fp.nitems_per_input
     assert len(list(fp_pruned.items())) == 2 * nkeep
+    assert len(fp_pruned) == 2 * nkeep
 
     def get_kwargs(file_pattern):
         sig = inspect.signature(file_pattern.__init__)